@@ -1,102 +1,30 @@
 #!/usr/bin/env python3
 
-class Stack:
-    def __init__(self):
-        self.s = []
+import os
+import sys
 
-    def push(self, v):
-        self.s.append(v)
+# the code lives in the algs4 package at the top of the repo
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
 
-    def pop(self):
-        return self.s.pop()
-
-    def __bool__(self):
-        return not not self.s
-
-    def __len__(self):
-        return len(self.s)
-
-    def __str__(self):
-        return str(self.s)
-
-class Queue:
-    def __init__(self):
-        self.H = Stack()
-        self.T = Stack()
-        self.H1 = Stack()
-        self.HR = Stack()
-        self.T1 = Stack()
-        self.h = Stack()
-        self.h1 = Stack()
-        self.deleted = 0
-
-    def enqueue(self, v):
-        if self._copy():
-            self.T1.push(v)
-        else:
-            self.T.push(v)
-
-    def dequeue(self):
-        if self._copy():
-            self.deleted += 1
-            return self.h.pop()
-        else:
-            self.h.pop()
-            return self.H.pop()
-
-    def debug(self):
-        print('---inner status---')
-        print(f'self.T: {self.T}')
-        print(f'self.H: {self.H}')
-        print(f'self.T1: {self.T1}')
-        print(f'self.H1: {self.H1}')
-        print(f'self.HR: {self.HR}')
-        print(f'self.h: {self.h}')
-        print(f'self.h1: {self.h1}')
-        print(f'self.deleted: {self.deleted}')
-        print('---inner status end---')
-
-    def _copy(self):
-        if len(self.T) < len(self.H) + 1 and not self.HR:
-            return False
-
-        # self._copy_step()
-        status = self._copy_step()
-        if status == False:
-            self.T = self.T1
-            self.T1 = Stack()
-            self.H = self.H1
-            self.H1 = Stack()
-            self.HR = Stack()
-            self.h = self.h1
-            self.h1 = Stack()
-            self.deleted = 0
-        return status
-
-    def _copy_step(self):
-        '''copy finished return False else True'''
-        if self.T:
-            v = self.T.pop()
-            self.H1.push(v)
-            self.h1.push(v)
-        if self.H:
-            self.HR.push(self.H.pop())
-        if not self.T and not self.H:
-            if len(self.HR) <= self.deleted:
-                return False
-            else:
-                v = self.HR.pop()
-                self.H1.push(v)
-                self.h1.push(v)
-                if len(self.HR) <= self.deleted:
-                    return False
-                else:
-                    return True
-        else:
-            return True
+from algs4.queue_benchmark import (
+    benchmark, benchmark_deque, benchmark_persistent)
+from algs4.seven_stacks_queue import (
+    Deque, PersistentQueue, PersistentStack, Queue, Stack)
 
 if __name__ == '__main__':
+    if sys.argv[1:2] == ['bench']:
+        # usage: 7StacksImplementQueue-1.3.49.py bench [N]
+        n = int(sys.argv[2]) if sys.argv[2:] else 1 << 16
+        benchmark(n)
+        benchmark_deque(n)
+        # copying snapshots is O(N) per operation
+        benchmark_persistent(max(1, n >> 6))
+        sys.exit()
+
     q = Queue()
+    q.enqueue_many(range(100, 105))
+    print(q.dequeue_many(3))
     for i in range(20):
         q.enqueue(i)
         # q.debug()
@@ -106,3 +34,13 @@ if __name__ == '__main__':
     for _ in range(10):
         print(q.dequeue())
 
+    d = Deque()
+    for i in range(5):
+        d.push_front(i)
+        d.push_back(i + 10)
+    print([d.pop_back() for _ in range(7)], d.pop_front())
+
+    v0 = PersistentQueue().enqueue_many(range(3))
+    x, v1 = v0.dequeue()
+    print(x, v0.dequeue_many(3)[0], v1.enqueue(3).dequeue_many(3)[0])
+
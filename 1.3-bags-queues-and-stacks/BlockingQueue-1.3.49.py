@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+import asyncio
+import os
+import queue
+import sys
+
+# the code lives in the algs4 package at the top of the repo
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from algs4.async_queue import AsyncBoundedQueue
+from algs4.blocking_queue import BoundedQueue, benchmark
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['bench']:
+        # usage: BlockingQueue-1.3.49.py bench [ITEMS]
+        benchmark(*map(int, sys.argv[2:3]))
+        sys.exit()
+
+    q = BoundedQueue(3)
+    for i in range(3):
+        q.put(i)
+    try:
+        q.put(3, timeout=0.1)
+    except queue.Full:
+        print('full')
+    print(q.get(), q.get_many(5))
+
+    async def main():
+        q = AsyncBoundedQueue(2)
+        await q.put(0)
+        await q.put(1)
+        try:
+            await q.put(2, timeout=0.1)
+        except asyncio.QueueFull:
+            print('full')
+        print(await q.get_many(5))
+        try:
+            await q.get(timeout=0.1)
+        except asyncio.QueueEmpty:
+            print('empty')
+
+    asyncio.run(main())
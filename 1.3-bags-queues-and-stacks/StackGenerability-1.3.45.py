@@ -1,21 +1,26 @@
 #!/usr/bin/env python3
 
-from collections import deque
+import os
+import sys
 
-def is_valid(l):
-    s = deque()
-    i = 0
-    for out in l:
-        while not s or s[-1] != out:
-            if i >= len(l):
-                return False
-            s.append(i)
-            i += 1
-        s.pop()
-    return not s
+# the code lives in the algs4 package at the top of the repo
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
 
+from algs4.stack_generability import (
+    first_invalid, first_invalid_many, is_valid, read_ints)
 
 if __name__ == '__main__':
+    if sys.argv[1:]:
+        # usage: StackGenerability-1.3.45.py TRACE
+        # TRACE holds the pop order of 0, 1, 2, ..., '-' for stdin
+        if sys.argv[1] == '-':
+            print(first_invalid(read_ints(sys.stdin)))
+        else:
+            with open(sys.argv[1]) as f:
+                print(first_invalid(read_ints(f)))
+        sys.exit()
+
     l = [0, 1, 2, 3, 4, 5]
     print(f'{l}: {is_valid(l)}')
     l = [1, 2, 3, 0]
@@ -26,4 +31,5 @@ if __name__ == '__main__':
     print(f'{l}: {is_valid(l)}')
     l = [3, 0, 1, 2]
     print(f'{l}: {is_valid(l)}')
-
+    print(first_invalid('cab', 'abc'))
+    print(first_invalid_many([[1, 0, 2], [2, 0, 1]]))
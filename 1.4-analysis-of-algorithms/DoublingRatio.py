@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+# the code lives in the algs4 package at the top of the repo
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from algs4.doubling_ratio import main
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -1,45 +1,41 @@
 #!/usr/bin/env python3
 
-import random
+import os
 import pprint
+import random
+import sys
 
-def find_minimum(m, top, left, bottom, right):
-    minvalue = float('inf')
-    minij = (0, 0)
-    midrow = (top + bottom) // 2
-    midcol = (left + right) // 2
-
-    for j in range(left, right + 1):
-        for i in (top, midrow, bottom):
-            if m[i][j] < minvalue:
-                minvalue = m[i][j]
-                minij = (i, j)
-
-    for i in range(top, bottom + 1):
-        for j in (left, midcol, right):
-            if m[i][j] < minvalue:
-                minvalue = m[i][j]
-                minij = (i, j)
-
-    if bottom - top == 2 or right - left == 2:
-        return minij
-    else:
-        i, j = minij
-        neighbours = [(i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)]
-        for l in neighbours:
-            if 0 <= l[0] < len(m) and 0 <= l[1] < len(m):
-                if m[i][j] > m[l[0]][l[1]]:
-                    if l[0] < midrow and l[1] < midcol:
-                        return find_minimum(m, top, left, midrow, midcol)
-                    elif l[0] > midrow and l[1] < midcol:
-                        return find_minimum(m, midrow, left, bottom, midcol)
-                    elif l[0] < midrow and l[1] > midcol:
-                        return find_minimum(m, top, midcol, midrow, right)
-                    else:
-                        return find_minimum(m, midrow, midcol, bottom, right)
-        return minij
+# the code lives in the algs4 package at the top of the repo
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from algs4.local_minimum_of_a_matrix import (
+    BinaryMatrix, BowlCells, CellMatrix, find_minimum, local_minima,
+    local_minimum, report_probes)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 if __name__ == '__main__':
+    if sys.argv[1:2] == ['probe']:
+        # usage: LocalMinimumOfAMatrix-1.4.19.py probe
+        # probes grow linearly on matrices too big to store, the bowl
+        # makes the search go down every level: the first cross probes
+        # 3 (M + N) cells and every level halves it, 6 (M + N) in all
+        for shape in ((1000, 1000), (10000, 10000), (100000, 100000),
+                      (1000, 100000)):
+            report_probes(CellMatrix(BowlCells(shape), shape))
+        sys.exit()
+    if sys.argv[1:]:
+        # usage: LocalMinimumOfAMatrix-1.4.19.py FILE M N [DTYPE [ORDER]]
+        # FILE is a raw binary matrix, DTYPE defaults to <f8, ORDER to C
+        path, M, N = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+        with BinaryMatrix(path, (M, N), *sys.argv[4:6]) as m:
+            report_probes(m)
+        sys.exit()
+
     pp = pprint.PrettyPrinter(indent=2)
     for _ in range(20):
         N = random.randint(3, 50)
@@ -54,4 +50,16 @@ if __name__ == '__main__':
                     print(f'function find wrong minimum at {(i, j)}')
                     break
 
+    if np is not None:
+        a = np.random.randint(0, 100, (20, random.randint(3, 50),
+                                       random.randint(3, 50)))
+        for k, (i, j) in enumerate(local_minima(a)):
+            M, N = a[k].shape
+            if (i, j) != local_minimum(a[k]):
+                print(f'local_minima differs at {k}')
+            for l in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+                if 0 <= l[0] < M and 0 <= l[1] < N and a[k][l] < a[k, i, j]:
+                    print(f'wrong at size {M} * {N}!')
+                    break
+
 
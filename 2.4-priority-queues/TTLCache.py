@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+# the code lives in the algs4 package at the top of the repo
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from algs4.ttl_cache import TTLCache, benchmark
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['bench']:
+        # usage: TTLCache.py bench [N]
+        benchmark(*map(int, sys.argv[2:3]))
+        sys.exit()
+
+    cache = TTLCache(3, ttl=10)
+    for i, key in enumerate('dbca'):
+        cache.put(key, i, now=i)
+    print(list(cache.keys()))   # d was the least recently used one
+    print(cache.get('b', now=4), cache.get('d', now=4))
+    cache.put('e', 4, ttl=1, now=5)   # c is now the least recently used
+    print(list(cache.keys()), cache.floor('c'), cache.ceiling('c'))
+    print(cache.touch('a', now=6), cache.evict_expired(now=7))
+    print(list(cache.keys()), dict(cache.stats))
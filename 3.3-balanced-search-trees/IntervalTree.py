@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+# the code lives in the algs4 package at the top of the repo
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from algs4.interval_tree import IntervalTree, benchmark
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['bench']:
+        # usage: IntervalTree.py bench [N]
+        benchmark(*map(int, sys.argv[2:3]))
+        sys.exit()
+
+    tree = IntervalTree()
+    for i, (lo, hi) in enumerate([(17, 19), (5, 8), (21, 24), (4, 8),
+                                  (15, 18), (7, 10), (16, 22)]):
+        tree.put((lo, hi, i), f'range {i}')
+    print(list(tree.overlapping(9, 16)))
+    print(list(tree.containing(21)))
+    tree.delete((16, 22, 6))
+    print(list(tree.containing(21)), tree.root.max)
+
+    tree = IntervalTree.from_sorted(((i, i + 2), i) for i in range(0, 20, 2))
+    print(tree.stats(), list(tree.overlapping(5, 8)))
@@ -0,0 +1,48 @@
+"""Data structures and algorithms of the exercises as an importable package.
+
+Top level names are imported from their submodule on first access, so
+``import algs4`` is nearly free and using one structure doesn't import the
+others(or numpy, asyncio, ...). ``python -m algs4.importtime`` measures it.
+"""
+
+import importlib
+
+_SUBMODULES = {
+    'IndexMinPQ': 'index_min_pq',
+    'InstrumentedIndexMinPQ': 'index_min_pq',
+    'RBTree': 'rbtree',
+    'InstrumentedRBTree': 'rbtree',
+    'IntervalTree': 'interval_tree',
+    'GeneralizedQueue': 'generalized_queue',
+    'Stack': 'seven_stacks_queue',
+    'PersistentStack': 'seven_stacks_queue',
+    'Queue': 'seven_stacks_queue',
+    'PersistentQueue': 'seven_stacks_queue',
+    'Deque': 'seven_stacks_queue',
+    'BoundedQueue': 'blocking_queue',
+    'AsyncBoundedQueue': 'async_queue',
+    'is_valid': 'stack_generability',
+    'first_invalid': 'stack_generability',
+    'first_invalid_many': 'stack_generability',
+    'read_ints': 'stack_generability',
+    'find_minimum': 'local_minimum_of_a_matrix',
+    'local_minimum': 'local_minimum_of_a_matrix',
+    'local_minima': 'local_minimum_of_a_matrix',
+    'ArrayMatrix': 'local_minimum_of_a_matrix',
+    'CellMatrix': 'local_minimum_of_a_matrix',
+    'BinaryMatrix': 'local_minimum_of_a_matrix',
+    'TTLCache': 'ttl_cache',
+}
+
+__all__ = sorted(_SUBMODULES)
+
+def __getattr__(name):
+    if name not in _SUBMODULES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module = importlib.import_module(f'.{_SUBMODULES[name]}', __name__)
+    value = getattr(module, name)
+    globals()[name] = value # later lookups don't come here
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
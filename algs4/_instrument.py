@@ -0,0 +1,52 @@
+"""Shared pieces of the instrumented IndexMinPQ and RBTree"""
+
+import functools
+from collections import Counter
+
+def operation(method):
+    """count the events inside method under its name, unless it is called
+    by another counted operation, e.g. delete() inside delMin()
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        if self._op is not None:
+            return method(self, *args)
+        self._op = method.__name__
+        try:
+            return method(self, *args)
+        finally:
+            self._op = None
+    return wrapper
+
+class Counting:
+    """counts[operation][event] of the events counted by _count(), and
+    hook(operation, event) called on every event if given
+    """
+    def _start_counting(self, hook):
+        self.counts = {}
+        self.hook = hook
+        self._op = None
+
+    def _count(self, event):
+        counter = self.counts.get(self._op)
+        if counter is None:
+            counter = self.counts[self._op] = Counter()
+        counter[event] += 1
+        if self.hook is not None:
+            self.hook(self._op, event)
+
+_classes = {}
+
+def instrumented(cls, counted):
+    """the class to build for cls(..., instrument=True): counted if cls is
+    its plain base class, otherwise a subclass of cls and counted made once,
+    so the events of the methods cls overrides are counted too
+    """
+    if issubclass(cls, counted):
+        return cls
+    if issubclass(counted, cls):
+        return counted
+    if cls not in _classes:
+        _classes[cls] = type(f'Instrumented{cls.__name__}', (cls, counted),
+                             {'__module__': cls.__module__})
+    return _classes[cls]
@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+from .seven_stacks_queue import Queue
+
+class AsyncBoundedQueue:
+    """asyncio version of BoundedQueue, raise asyncio.QueueFull and
+    asyncio.QueueEmpty on timeout
+    """
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self.q = Queue()
+        self.n = 0
+        lock = asyncio.Lock()
+        self.not_empty = asyncio.Condition(lock)
+        self.not_full = asyncio.Condition(lock)
+
+    def qsize(self):
+        return self.n
+
+    def _has_room(self):
+        return self.maxsize <= 0 or self.n < self.maxsize
+
+    async def _wait(self, cond, predicate, timeout):
+        """a notify() may have picked this waiter right before it timed out
+        or was cancelled, pass it on to the next waiter so it isn't lost,
+        like asyncio.Queue does
+        """
+        if predicate():
+            return True
+        try:
+            await asyncio.wait_for(cond.wait_for(predicate), timeout)
+            return True
+        except asyncio.TimeoutError:
+            if predicate():
+                cond.notify()
+            return False
+        except asyncio.CancelledError:
+            if predicate():
+                cond.notify()
+            raise
+
+    async def put(self, item, timeout=None):
+        async with self.not_full:
+            if not await self._wait(self.not_full, self._has_room, timeout):
+                raise asyncio.QueueFull
+            self.q.enqueue(item)
+            self.n += 1
+            self.not_empty.notify()
+
+    async def get(self, timeout=None):
+        async with self.not_empty:
+            if not await self._wait(self.not_empty, lambda: self.n, timeout):
+                raise asyncio.QueueEmpty
+            item = self.q.dequeue()
+            self.n -= 1
+            self.not_full.notify()
+            return item
+
+    async def get_many(self, n, timeout=None):
+        """wait until the queue is not empty, return at most n elements"""
+        async with self.not_empty:
+            if not await self._wait(self.not_empty, lambda: self.n, timeout):
+                raise asyncio.QueueEmpty
+            k = min(n, self.n)
+            items = self.q.dequeue_many(k)
+            self.n -= k
+            self.not_full.notify(k)
+            return items
+
+async def _async(q, get, items, producers, consumers, batch):
+    """asyncio version of blocking_queue._threaded"""
+    latencies = []
+    clock = time.perf_counter_ns
+
+    async def produce(n):
+        for _ in range(n):
+            await q.put(clock())
+
+    async def consume():
+        while True:
+            got = await get(q, batch)
+            now = clock()
+            stop = 0
+            for t in got:
+                if t is None:
+                    stop += 1
+                else:
+                    latencies.append(now - t)
+            if stop:
+                for _ in range(stop - 1):
+                    await q.put(None)
+                return
+
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(consume()) for _ in range(consumers)]
+    await asyncio.gather(*(produce(items // producers)
+                           for _ in range(producers)))
+    for _ in range(consumers):
+        await q.put(None)
+    await asyncio.gather(*tasks)
+    return latencies, time.perf_counter() - start
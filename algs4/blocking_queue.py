@@ -0,0 +1,138 @@
+import queue
+import threading
+import time
+
+from .seven_stacks_queue import Queue
+
+class BoundedQueue:
+    """Thread-safe queue holding at most maxsize(<= 0 means unlimited)
+    elements on top of the real-time Queue, put() blocks when it is full
+    and get() blocks when it is empty. Raise queue.Full and queue.Empty on
+    timeout, same as queue.Queue
+    """
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self.q = Queue()
+        self.n = 0
+        self.mutex = threading.Lock()
+        self.not_empty = threading.Condition(self.mutex)
+        self.not_full = threading.Condition(self.mutex)
+
+    def qsize(self):
+        with self.mutex:
+            return self.n
+
+    def _has_room(self):
+        return self.maxsize <= 0 or self.n < self.maxsize
+
+    def put(self, item, timeout=None):
+        with self.not_full:
+            if not self.not_full.wait_for(self._has_room, timeout):
+                raise queue.Full
+            self.q.enqueue(item)
+            self.n += 1
+            self.not_empty.notify()
+
+    def get(self, timeout=None):
+        with self.not_empty:
+            if not self.not_empty.wait_for(lambda: self.n, timeout):
+                raise queue.Empty
+            item = self.q.dequeue()
+            self.n -= 1
+            self.not_full.notify()
+            return item
+
+    def get_many(self, n, timeout=None):
+        """wait until the queue is not empty, return at most n elements"""
+        with self.not_empty:
+            if not self.not_empty.wait_for(lambda: self.n, timeout):
+                raise queue.Empty
+            k = min(n, self.n)
+            items = self.q.dequeue_many(k)
+            self.n -= k
+            self.not_full.notify(k)
+            return items
+
+def _summary(label, latencies, seconds):
+    """latencies(ns) are from put() to get() of every item"""
+    latencies.sort()
+    p50, p99 = (latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+                for p in (0.5, 0.99))
+    print(f'{label:<26}{len(latencies) / seconds:>12.0f}{p50 // 1000:>9}'
+          f'{p99 // 1000:>9}{latencies[-1] // 1000:>9}')
+
+def _threaded(q, get, items, producers, consumers, batch):
+    """items are split between producers, every item is a put() timestamp.
+    consumers stop on None, a batch may carry several None so the extra
+    ones are put back
+    """
+    latencies = []
+    lock = threading.Lock()
+    clock = time.perf_counter_ns
+
+    def produce(n):
+        for _ in range(n):
+            q.put(clock())
+
+    def consume():
+        mine = []
+        while True:
+            got = get(q, batch)
+            now = clock()
+            stop = 0
+            for t in got:
+                if t is None:
+                    stop += 1
+                else:
+                    mine.append(now - t)
+            if stop:
+                for _ in range(stop - 1):
+                    q.put(None)
+                break
+        with lock:
+            latencies.extend(mine)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=consume) for _ in range(consumers)]
+    workers = [threading.Thread(target=produce, args=(items // producers,))
+               for _ in range(producers)]
+    for t in threads + workers:
+        t.start()
+    for t in workers:
+        t.join()
+    for _ in range(consumers):
+        q.put(None)
+    for t in threads:
+        t.join()
+    return latencies, time.perf_counter() - start
+
+def benchmark(items=1 << 17, maxsize=1024, producers=4, consumers=4,
+              batch=64):
+    """print throughput(items/s) and put-to-get latency percentiles(us) of
+    every queue with multiple producers and consumers
+    """
+    # only the benchmark pays for asyncio
+    import asyncio
+    from .async_queue import AsyncBoundedQueue, _async
+
+    def get_one(q, n):
+        return [q.get()]
+
+    async def async_get_one(q, n):
+        return [await q.get()]
+
+    print(f'{producers} producers, {consumers} consumers, maxsize {maxsize}')
+    print(f'{"queue":<26}{"items/s":>12}{"p50":>9}{"p99":>9}{"max":>9}')
+    for label, make, get in [
+            ('queue.Queue', queue.Queue, get_one),
+            ('BoundedQueue', BoundedQueue, get_one),
+            ('BoundedQueue get_many', BoundedQueue, BoundedQueue.get_many)]:
+        _summary(label, *_threaded(make(maxsize), get, items, producers,
+                                   consumers, batch))
+    for label, make, get in [
+            ('asyncio.Queue', asyncio.Queue, async_get_one),
+            ('AsyncBoundedQueue', AsyncBoundedQueue, async_get_one),
+            ('AsyncBoundedQueue get_many', AsyncBoundedQueue,
+             AsyncBoundedQueue.get_many)]:
+        _summary(label, *asyncio.run(_async(make(maxsize), get, items,
+                                            producers, consumers, batch)))
@@ -0,0 +1,330 @@
+"""Doubling ratio experiments(1.4.6) of every data structure and algorithm in
+this repo. Each benchmark runs at N, 2N, 4N, ... and reports for each
+operation the time, the ratio T(2N)/T(N) and the estimated exponent b of
+T(N) ~ aN^b, which is log2 of the ratio. Results can be saved as JSON and
+compared against a saved baseline to flag regressions. Every time is the
+fastest of calls repeated for --min-time seconds, and is compared relative
+to a reference loop timed next to it, so a machine that runs faster or
+slower than when the baseline was saved doesn't look like a regression.
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import platform
+import random
+import sys
+import time
+
+@contextlib.contextmanager
+def _timed(times, op):
+    start = time.perf_counter()
+    yield
+    times[op] = time.perf_counter() - start
+
+def bench_index_min_pq(n):
+    from .index_min_pq import IndexMinPQ
+    keys = [random.random() for _ in range(n)]
+    changes = [random.random() for _ in range(n)]
+    pq = IndexMinPQ(n)
+    times = {}
+    with _timed(times, 'insert'):
+        for i, key in enumerate(keys):
+            pq.insert(i, key)
+    with _timed(times, 'change'):
+        for i, key in enumerate(changes):
+            pq.change(i, key)
+    with _timed(times, 'delMin'):
+        while not pq.isEmpty():
+            pq.delMin()
+    return times
+
+def bench_rbtree(n):
+    from .rbtree import RBTree
+    keys = random.sample(range(n), n)
+    tree = RBTree()
+    times = {}
+    with _timed(times, 'put'):
+        for key in keys:
+            tree.put(key, key)
+    with _timed(times, 'get'):
+        for key in keys:
+            tree.get(key)
+    with _timed(times, 'rank'):
+        for key in keys:
+            tree.rank(key)
+    with _timed(times, 'delete'):
+        for key in keys:
+            tree.delete(key)
+    return times
+
+def bench_interval_tree(n):
+    from .interval_tree import IntervalTree
+    keys = sorted((lo, lo + random.randrange(16), i)
+                  for i, lo in enumerate(random.choices(range(n), k=n)))
+    items = [(key, None) for key in keys]
+    times = {}
+    with _timed(times, 'from_sorted'):
+        tree = IntervalTree.from_sorted(items)
+    with _timed(times, 'put'):
+        t = IntervalTree()
+        for key, val in items:
+            t.put(key, val)
+    with _timed(times, 'overlapping'):
+        for lo in range(0, n, 16):
+            for _ in tree.overlapping(lo, lo + 16):
+                pass
+    return times
+
+def bench_generalized_queue(n):
+    from .generalized_queue import GeneralizedQueue
+    ranks = [random.randint(1, n - i) for i in range(n)]
+    q = GeneralizedQueue()
+    times = {}
+    with _timed(times, 'insert'):
+        for i in range(n):
+            q.insert(i)
+    with _timed(times, 'delete'):
+        for k in ranks:
+            q.delete(k)
+    return times
+
+def bench_queue(n):
+    from .seven_stacks_queue import Queue
+    q = Queue()
+    times = {}
+    with _timed(times, 'enqueue'):
+        for i in range(n):
+            q.enqueue(i)
+    with _timed(times, 'dequeue'):
+        for _ in range(n):
+            q.dequeue()
+    with _timed(times, 'enqueue_many'):
+        for i in range(0, n, 64):
+            q.enqueue_many(range(i, min(i + 64, n)))
+    with _timed(times, 'dequeue_many'):
+        for i in range(0, n, 64):
+            q.dequeue_many(min(64, n - i))
+    return times
+
+def bench_is_valid(n):
+    from .stack_generability import is_valid
+    # a random valid pop order
+    s, l = [], []
+    i = 0
+    while len(l) < n:
+        if i < n and (not s or random.random() < 0.5):
+            s.append(i)
+            i += 1
+        else:
+            l.append(s.pop())
+    times = {}
+    with _timed(times, 'is_valid'):
+        is_valid(l)
+    return times
+
+class _BowlRows:
+    """N * N list of lists view of a BowlCells for find_minimum, computed on
+    access so large N doesn't need N^2 memory. On random values the first
+    cross almost always holds a local minimum, the bowl makes the search go
+    down every level
+    """
+    class Row:
+        def __init__(self, cells, i):
+            self.cells = cells
+            self.i = i
+
+        def __getitem__(self, j):
+            return self.cells.cell(self.i, j)
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    def __len__(self):
+        return self.cells.shape[0]
+
+    def __getitem__(self, i):
+        return self.Row(self.cells, i)
+
+def bench_find_minimum(n):
+    from .local_minimum_of_a_matrix import (
+        BowlCells, CellMatrix, find_minimum, local_minimum)
+    cells = BowlCells((n, n))
+    times = {}
+    with _timed(times, 'find_minimum'):
+        find_minimum(_BowlRows(cells), 0, 0, n - 1, n - 1)
+    with _timed(times, 'local_minimum'):
+        local_minimum(CellMatrix(cells, cells.shape))
+    return times
+
+BENCHMARKS = {
+    'IndexMinPQ': bench_index_min_pq,
+    'RBTree': bench_rbtree,
+    'IntervalTree': bench_interval_tree,
+    'GeneralizedQueue': bench_generalized_queue,
+    'Queue': bench_queue,
+    'is_valid': bench_is_valid,
+    'find_minimum': bench_find_minimum,
+}
+
+def _reference():
+    """seconds of a fixed pure Python loop that uses no code of this repo.
+    The speed of a machine drifts between runs, so compare() looks at
+    times relative to this one measured next to them
+    """
+    start = time.perf_counter()
+    x = 0
+    for i in range(20000):
+        x = (x * 31 + i) % 1000003
+    return time.perf_counter() - start
+
+def _measure(bench, n, repeat, min_time):
+    """return {op: (seconds, total)} and the reference seconds. bench(n)
+    is called at least repeat times and until every op was timed for
+    min_time seconds in total, or the calls took 10 times that. seconds is
+    the fastest call, slower ones were disturbed by something else, total
+    is the time it was picked from. The reference is timed after every
+    call and the fastest one is kept too
+    """
+    best = {}
+    totals = {}
+    reference = math.inf
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        random.seed(n)
+        for op, seconds in bench(n).items():
+            best[op] = min(best.get(op, math.inf), seconds)
+            totals[op] = totals.get(op, 0) + seconds
+        reference = min(reference, _reference())
+        calls += 1
+        if calls >= repeat and (min(totals.values()) >= min_time
+                                or time.perf_counter() - start
+                                >= 10 * min_time):
+            break
+    return {op: (best[op], totals[op]) for op in best}, reference
+
+def run(names, start, stop, repeat, budget, min_time=0.1):
+    """return {name: {op: [{n, seconds, total, reference, ratio,
+    exponent}]}}, N doubles from start until it exceeds stop or a call
+    takes more than budget seconds. See _measure for the times
+    """
+    results = {}
+    print(f'{"benchmark":<24}{"op":<14}{"N":>9}{"seconds":>12}'
+          f'{"ratio":>8}{"b":>7}')
+    for name in names:
+        bench = BENCHMARKS[name]
+        ops = results[name] = {}
+        n = start
+        while n <= stop:
+            best, reference = _measure(bench, n, repeat, min_time)
+            for op, (seconds, total) in best.items():
+                rows = ops.setdefault(op, [])
+                ratio = exponent = None
+                if rows and rows[-1]['seconds'] > 0:
+                    ratio = seconds / rows[-1]['seconds']
+                    exponent = math.log2(ratio) if ratio > 0 else None
+                rows.append({'n': n, 'seconds': seconds, 'total': total,
+                             'reference': reference, 'ratio': ratio,
+                             'exponent': exponent})
+                # a * marks a time too short to be compared
+                print(f'{name:<24}{op:<14}{n:>9}{seconds:>12.6f}'
+                      f'{_fmt(ratio, 8, 2)}{_fmt(exponent, 7, 2)}'
+                      f'{"" if total >= min_time else " *"}')
+            if sum(seconds for seconds, _ in best.values()) > budget:
+                break
+            n *= 2
+    return results
+
+def _fmt(v, width, digits):
+    return f'{"-":>{width}}' if v is None else f'{v:>{width}.{digits}f}'
+
+def _relative(row):
+    return row['seconds'] / row['reference']
+
+def _slope(rows):
+    """least squares b of log2(relative time) = b * log2(N) + c"""
+    xs = [math.log2(row['n']) for row in rows]
+    ys = [math.log2(_relative(row)) for row in rows]
+    mx = sum(xs) / len(xs)
+    my = sum(ys) / len(ys)
+    return (sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+            / sum((x - mx) ** 2 for x in xs))
+
+def compare(results, baseline, tolerance, min_time=0.1):
+    """return regressions of results against baseline, on times relative
+    to the reference of their run: an op at some N is more than tolerance
+    slower, or the exponent fitted over the common N(at least 3 of them)
+    grew by more than 0.25. Times picked from less than min_time seconds
+    in either run are too noisy and are left out
+    """
+    regressions = []
+    for name, ops in results.items():
+        for op, rows in ops.items():
+            base = {row['n']: row
+                    for row in baseline.get(name, {}).get(op, [])}
+            common = [row for row in rows if row['n'] in base
+                      and row['total'] >= min_time
+                      and base[row['n']].get('total', 0) >= min_time
+                      and row['seconds'] > 0
+                      and base[row['n']]['seconds'] > 0]
+            for row in common:
+                old = base[row['n']]
+                slower = _relative(row) / _relative(old)
+                if slower > 1 + tolerance:
+                    regressions.append(
+                        f'{name}.{op} N={row["n"]}: {row["seconds"]:.6f}s, '
+                        f'baseline {old["seconds"]:.6f}s (x{slower:.2f} '
+                        f'relative to the reference)')
+            if len(common) >= 3:
+                new = _slope(common)
+                old = _slope([base[row['n']] for row in common])
+                if new > old + 0.25:
+                    regressions.append(
+                        f'{name}.{op} N={common[0]["n"]}..{common[-1]["n"]}: '
+                        f'exponent {new:.2f}, baseline {old:.2f}')
+    return regressions
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('names', nargs='*', default=list(BENCHMARKS),
+                        help=f'benchmarks to run, from {", ".join(BENCHMARKS)}')
+    parser.add_argument('--start', type=int, default=1024)
+    parser.add_argument('--stop', type=int, default=1 << 17)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--budget', type=float, default=1.0,
+                        help='stop doubling once a run takes longer')
+    parser.add_argument('--save', help='write results to this JSON file')
+    parser.add_argument('--baseline', help='compare against this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown against the baseline')
+    parser.add_argument('--min-time', type=float, default=0.1,
+                        help='time every op at least this long in total, '
+                        'shorter times are not compared')
+    args = parser.parse_args(argv)
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error(f'unknown benchmark {name}')
+
+    results = run(args.names, args.start, args.stop, args.repeat,
+                  args.budget, args.min_time)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': platform.python_version(),
+                       'machine': platform.machine(),
+                       'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                       'results': results}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)['results'],
+                                  args.tolerance, args.min_time)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        if regressions:
+            return 1
+        print('no regression against baseline')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,27 @@
+from .rbtree import RBTree
+
+class GeneralizedQueue:
+    """elements are keyed by insertion order in the shared RBTree, so the
+    k-th least recently inserted one is found by select
+    """
+    def __init__(self):
+        self.tree = RBTree()
+        self._counter = 0
+
+    def empty(self):
+        return self.tree.is_empty()
+
+    def insert(self, val):
+        self.tree.put(self._counter, val)
+        self._counter += 1
+
+    def delete(self, k):
+        """delete and return the k-th(1-indexed) least recently inserted
+        element, raise ValueError if k is not legal
+        """
+        if not 1 <= k <= self.tree.size():
+            raise ValueError('k not legal')
+        key = self.tree.select(k - 1)
+        val = self.tree.get(key)
+        self.tree.delete(key)
+        return val
@@ -0,0 +1,67 @@
+"""Import time of the package, every measurement runs in a fresh interpreter
+so nothing is cached in sys.modules.
+
+usage: python -m algs4.importtime [NAME ...] [--repeat R]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+from . import __all__ as NAMES
+from . import _SUBMODULES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+import algs4
+mid = time.perf_counter()
+{access}
+end = time.perf_counter()
+print(mid - start, end - mid, len(sys.modules))
+'''
+
+def measure(access, repeat):
+    """return the best seconds of `import algs4`, of the statements in
+    access after it, and the number of modules loaded in the end
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, '-c', _SCRIPT.format(access=access)],
+            env=env, capture_output=True, text=True, check=True).stdout
+        package, first, modules = out.split()
+        run = (float(package), float(first), int(modules))
+        best = run if best is None else (min(best[0], run[0]),
+                                         min(best[1], run[1]), run[2])
+    return best
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('names', nargs='*', default=NAMES,
+                        help='top level names to access')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+    for name in args.names:
+        if name not in _SUBMODULES:
+            parser.error(f'unknown name {name}')
+
+    # importing every submodule up front is what the lazy attributes avoid
+    eager = '\n'.join(f'import algs4.{m}'
+                      for m in sorted(set(_SUBMODULES.values())))
+    print(f'{"access":<24}{"import ms":>11}{"first ms":>10}{"modules":>9}')
+    for label, access in ([('(nothing)', 'pass')]
+                          + [(name, f'algs4.{name}') for name in args.names]
+                          + [('(every submodule)', eager)]):
+        package, first, modules = measure(access, args.repeat)
+        print(f'{label:<24}{package * 1e3:>11.2f}{first * 1e3:>10.2f}'
+              f'{modules:>9}')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
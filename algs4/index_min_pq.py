@@ -0,0 +1,231 @@
+from ._instrument import Counting, instrumented, operation
+
+class IndexMinPQ:
+    def __new__(cls, N, instrument=False, hook=None):
+        '''IndexMinPQ(N, instrument=True) or with a hook builds an
+        InstrumentedIndexMinPQ, so the plain class pays nothing for it'''
+        if instrument or hook is not None:
+            cls = instrumented(cls, InstrumentedIndexMinPQ)
+        return super().__new__(cls)
+
+    def __init__(self, N, instrument=False, hook=None):
+        self._MAXN = N
+        self._keys = [-1] * N   # here means element's values
+        self._pq = [-1] * N     # index: 0-indexed heap position
+                                # value: index of _keys, i.e., _keys[_pq[i]]
+        self._qp = [-1] * N     # _qp[j] = i means _pq[i] = j
+        self._size = 0          # N in textbook
+
+    def debug(self):
+        print(self._keys)
+        print(self._pq)
+        print(self._qp)
+        for i, v in enumerate(self._pq):
+            if v == -1:
+                continue
+            if self._qp[v] != i:
+                print('_pq and _qp illegal! \n_pq:')
+                print('_qp:')
+                return
+        print('pass _pq and _qp check')
+        for i in self._pq:
+            print(self._keys[i])
+
+    def size(self):
+        return self._size
+
+    def isEmpty(self):
+        return self._size == 0
+
+    def contains(self, i):
+        return self._qp[i] != -1
+
+    def keyOf(self, i):
+        if not self.contains(i):
+            raise ValueError('index is not used')
+        return self._keys[i]
+
+    def minKey(self):
+        if self.isEmpty():
+            raise ValueError('empty!')
+        return self._keys[self._pq[0]]
+
+    def minIndex(self):
+        if self.isEmpty():
+            raise ValueError('empty!')
+        return self._pq[0]
+
+    def delMin(self):
+        '''return deleted index'''
+        minindex = self.minIndex()
+        self.delete(minindex)
+        return minindex
+
+    def insert(self, i, key):
+        if self.contains(i):
+            raise ValueError('index is used')
+
+        self._keys[i] = key
+        self._pq[self._size] = i
+        self._qp[i] = self._size
+        self._size += 1
+        self._swim(0, self._size - 1)
+
+    def change(self, i, key):
+        if not self.contains(i):
+            raise ValueError('index is not used')
+
+        oldkey = self._keys[i];
+        if key == oldkey:
+            return
+        self._keys[i] = key
+        if key > oldkey:
+            self._sink(self._qp[i])
+        else:
+            self._swim(0, self._qp[i])
+
+    def delete(self, i):
+        if not self.contains(i):
+            raise ValueError('index is not used')
+
+        index = self._qp[i]
+        self._size -= 1
+        self._pq[index] = self._pq[self._size]
+        self._qp[self._pq[index]] = index
+        self._pq[self._size] = -1
+        self._qp[i] = -1
+        self._keys[i] = -1
+        if index < self._size:  # the last one was deleted, nothing to move
+            self._sinkbottom(index)
+
+    def _swim(self, startpos, pos):
+        '''based on _siftdown in heapq from cpython'''
+        newitem = self._pq[pos]
+        while pos > startpos:
+            parentpos = (pos - 1) >> 1
+            parentitem = self._pq[parentpos]
+            if self._keys[newitem] < self._keys[parentitem]:
+                self._pq[pos] = parentitem
+                self._qp[parentitem] = pos
+                pos = parentpos
+                continue
+            break
+        self._pq[pos] = newitem
+        self._qp[newitem] = pos
+
+    def _sinkbottom(self, pos):
+        '''based on _siftup in heapq from cpython'''
+        endpos = self._size
+        newitem = self._pq[pos]
+        childpos = 2 * pos + 1
+        while childpos < endpos:
+            rightpos = childpos + 1
+            childitem = self._pq[childpos]
+            if rightpos < endpos and not self._keys[childitem] < self._keys[self._pq[rightpos]]:
+                childpos = rightpos
+                childitem = self._pq[childpos]
+            self._pq[pos] = childitem
+            self._qp[childitem] = pos
+            pos = childpos
+            childpos = 2 * pos + 1
+        self._pq[pos] = newitem
+        self._qp[newitem] = pos
+        # unlike heapq, pos may be any deleted position, so newitem may
+        # have to go above it
+        self._swim(0, pos)
+
+    def _sink(self, pos):
+        endpos = self._size
+        newitem = self._pq[pos]
+        childpos = 2 * pos + 1
+        while childpos < endpos:
+            rightpos = childpos + 1
+            childitem = self._pq[childpos]
+            if rightpos < endpos and not self._keys[childitem] < self._keys[self._pq[rightpos]]:
+                childpos = rightpos
+                childitem = self._pq[childpos]
+            if self._keys[newitem] > self._keys[childitem]:
+                self._pq[pos] = childitem
+                self._qp[childitem] = pos
+                pos = childpos
+                childpos = 2 * pos + 1
+                continue
+            break
+        self._pq[pos] = newitem
+        self._qp[newitem] = pos
+
+class InstrumentedIndexMinPQ(Counting, IndexMinPQ):
+    """IndexMinPQ counting key compares and exchanges(an item moving one
+    level in the heap) per operation in counts, e.g.
+    counts['insert']['compares']. hook(operation, event) is called on every
+    event if given
+    """
+    def __init__(self, N, instrument=True, hook=None):
+        super().__init__(N)
+        self._start_counting(hook)
+
+    insert = operation(IndexMinPQ.insert)
+    change = operation(IndexMinPQ.change)
+    delete = operation(IndexMinPQ.delete)
+    delMin = operation(IndexMinPQ.delMin)
+
+    def _swim(self, startpos, pos):
+        newitem = self._pq[pos]
+        while pos > startpos:
+            parentpos = (pos - 1) >> 1
+            parentitem = self._pq[parentpos]
+            self._count('compares')
+            if self._keys[newitem] < self._keys[parentitem]:
+                self._count('exchanges')
+                self._pq[pos] = parentitem
+                self._qp[parentitem] = pos
+                pos = parentpos
+                continue
+            break
+        self._pq[pos] = newitem
+        self._qp[newitem] = pos
+
+    def _sinkbottom(self, pos):
+        endpos = self._size
+        newitem = self._pq[pos]
+        childpos = 2 * pos + 1
+        while childpos < endpos:
+            rightpos = childpos + 1
+            childitem = self._pq[childpos]
+            if rightpos < endpos:
+                self._count('compares')
+                if not self._keys[childitem] < self._keys[self._pq[rightpos]]:
+                    childpos = rightpos
+                    childitem = self._pq[childpos]
+            self._count('exchanges')
+            self._pq[pos] = childitem
+            self._qp[childitem] = pos
+            pos = childpos
+            childpos = 2 * pos + 1
+        self._pq[pos] = newitem
+        self._qp[newitem] = pos
+        self._swim(0, pos)
+
+    def _sink(self, pos):
+        endpos = self._size
+        newitem = self._pq[pos]
+        childpos = 2 * pos + 1
+        while childpos < endpos:
+            rightpos = childpos + 1
+            childitem = self._pq[childpos]
+            if rightpos < endpos:
+                self._count('compares')
+                if not self._keys[childitem] < self._keys[self._pq[rightpos]]:
+                    childpos = rightpos
+                    childitem = self._pq[childpos]
+            self._count('compares')
+            if self._keys[newitem] > self._keys[childitem]:
+                self._count('exchanges')
+                self._pq[pos] = childitem
+                self._qp[childitem] = pos
+                pos = childpos
+                childpos = 2 * pos + 1
+                continue
+            break
+        self._pq[pos] = newitem
+        self._qp[newitem] = pos
@@ -0,0 +1,154 @@
+from .rbtree import RBTree
+
+class IntervalTree(RBTree):
+    """RBTree of closed intervals, keys are (lo, hi, ...) tuples ordered by
+    lo, extra items like an id keep equal intervals apart. Every node also
+    keeps max, the largest hi in its subtree, which is maintained wherever
+    size is, so put/delete stay O(log n).
+
+    A subtree whose max is below the query can't overlap it and one whose
+    root starts after the query can't have overlapping right part, so the
+    queries visit O(log n) nodes plus the ancestors of the k intervals
+    found: O(log n + k) when they are close in lo order, never more than
+    O(log n + k log(n / k))
+    """
+    class Node(RBTree.Node):
+        def __init__(self, key, val, color=RBTree.Node.RED, size=1):
+            super().__init__(key, val, color, size)
+            self.max = key[1]
+
+    def put(self, key, val):
+        if key[1] < key[0]:
+            raise ValueError('interval should have lo <= hi')
+        super().put(key, val)
+
+    def _adjust_size(self, n):
+        n.size = 1 + self._size(n.left) + self._size(n.right)
+        m = n.key[1]
+        if n.left is not None and n.left.max > m:
+            m = n.left.max
+        if n.right is not None and n.right.max > m:
+            m = n.right.max
+        n.max = m
+
+    def _rotate_left(self, h):
+        m = h.max
+        x = super()._rotate_left(h)
+        x.max = m
+        return x
+
+    def _rotate_right(self, h):
+        m = h.max
+        x = super()._rotate_right(h)
+        x.max = m
+        return x
+
+    def overlapping(self, lo, hi):
+        """lazily yield the keys of intervals overlapping [lo, hi] by lo"""
+        stack = []
+        x = self.root
+        while stack or x is not None:
+            # go down the left spine, skip subtrees ending before lo
+            while x is not None and x.max >= lo:
+                stack.append(x)
+                x = x.left
+            if not stack:
+                return
+            x = stack.pop()
+            if x.key[0] > hi:
+                return # x and everything after it start after hi
+            if x.key[1] >= lo:
+                yield x.key
+            x = x.right
+
+    def containing(self, t):
+        """lazily yield the keys of intervals containing point t by lo"""
+        return self.overlapping(t, t)
+
+    @classmethod
+    def from_sorted(cls, items):
+        """build a tree from (key, value) pairs with increasing keys in
+        O(n), laying out the 2-3 tree the LLRB stands for directly instead
+        of n puts
+        """
+        items = list(items)
+        for i, (key, _) in enumerate(items):
+            if key[1] < key[0]:
+                raise ValueError('interval should have lo <= hi')
+            if i and not items[i - 1][0] < key:
+                raise ValueError('keys should be increasing')
+        tree = cls()
+        b = 0 # black height, 2^b - 1 <= n <= 3^b - 1 holds
+        while (1 << (b + 1)) - 1 <= len(items):
+            b += 1
+        tree.root = tree._build(items, 0, len(items), b)
+        if tree.root is not None:
+            tree.root.color = RBTree.Node.BLACK
+        return tree
+
+    def _build(self, items, start, stop, b):
+        """2-3 tree of black height b on items[start:stop], a 2-node while
+        two subtrees can hold the rest, otherwise a 3-node(a black node with
+        a red left child)
+        """
+        m = stop - start
+        if b == 0:
+            return None
+        if m - 1 <= 2 * (3 ** (b - 1) - 1):
+            mid = start + (m - 1) // 2
+            x = self.Node(*items[mid], RBTree.Node.BLACK)
+            x.left = self._build(items, start, mid, b - 1)
+            x.right = self._build(items, mid + 1, stop, b - 1)
+        else:
+            third = (m - 2) // 3
+            i = start + third
+            j = i + 1 + third + ((m - 2) % 3 == 2)
+            red = self.Node(*items[i])
+            red.left = self._build(items, start, i, b - 1)
+            red.right = self._build(items, i + 1, j, b - 1)
+            self._adjust_size(red)
+            x = self.Node(*items[j], RBTree.Node.BLACK)
+            x.left = red
+            x.right = self._build(items, j + 1, stop, b - 1)
+        self._adjust_size(x)
+        return x
+
+def benchmark(n=1 << 17, queries=1 << 12, span=1000):
+    """n random ranges of length below span over [0, n * 10): time building
+    by from_sorted and by puts, then overlap queries of windows of length
+    span against a linear scan
+    """
+    # only the benchmark pays for these
+    import random
+    import time
+
+    random.seed(n)
+    keys = sorted((lo, lo + random.randrange(span), i)
+                  for i, lo in enumerate(random.choices(range(n * 10), k=n)))
+    items = [(key, key[2]) for key in keys]
+
+    start = time.perf_counter()
+    tree = IntervalTree.from_sorted(items)
+    print(f'from_sorted {n:>9}: {time.perf_counter() - start:.3f}s')
+    shuffled = random.sample(items, n)
+    start = time.perf_counter()
+    t = IntervalTree()
+    for key, val in shuffled:
+        t.put(key, val)
+    print(f'put         {n:>9}: {time.perf_counter() - start:.3f}s')
+
+    windows = [(lo, lo + span) for lo in random.choices(range(n * 10),
+                                                        k=queries)]
+    found = 0
+    start = time.perf_counter()
+    for lo, hi in windows:
+        found += sum(1 for _ in tree.overlapping(lo, hi))
+    seconds = time.perf_counter() - start
+    print(f'overlapping {queries:>9}: {seconds / queries * 1e6:.1f}us per '
+          f'query, {found / queries:.1f} found')
+    start = time.perf_counter()
+    for lo, hi in windows[:queries >> 4]:
+        sum(1 for key in keys if key[0] <= hi and key[1] >= lo)
+    seconds = time.perf_counter() - start
+    print(f'linear scan {queries >> 4:>9}: '
+          f'{seconds / (queries >> 4) * 1e6:.1f}us per query')
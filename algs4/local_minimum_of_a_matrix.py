@@ -0,0 +1,368 @@
+import os
+
+def find_minimum(m, top, left, bottom, right):
+    minvalue = float('inf')
+    minij = (0, 0)
+    midrow = (top + bottom) // 2
+    midcol = (left + right) // 2
+
+    for j in range(left, right + 1):
+        for i in (top, midrow, bottom):
+            if m[i][j] < minvalue:
+                minvalue = m[i][j]
+                minij = (i, j)
+
+    for i in range(top, bottom + 1):
+        for j in (left, midcol, right):
+            if m[i][j] < minvalue:
+                minvalue = m[i][j]
+                minij = (i, j)
+
+    if bottom - top == 2 or right - left == 2:
+        return minij
+    else:
+        i, j = minij
+        neighbours = [(i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)]
+        for l in neighbours:
+            if 0 <= l[0] < len(m) and 0 <= l[1] < len(m):
+                if m[i][j] > m[l[0]][l[1]]:
+                    if l[0] < midrow and l[1] < midcol:
+                        return find_minimum(m, top, left, midrow, midcol)
+                    elif l[0] > midrow and l[1] < midcol:
+                        return find_minimum(m, midrow, left, bottom, midcol)
+                    elif l[0] < midrow and l[1] > midcol:
+                        return find_minimum(m, top, midcol, midrow, right)
+                    else:
+                        return find_minimum(m, midrow, midcol, bottom, right)
+        return minij
+
+class Matrix:
+    """Matrix read lazily by rows, columns or cells, counting how many
+    cells are probed and how many reads it takes. Subclasses implement
+    row(i, lo, hi) and col(j, lo, hi), both inclusive, returning a
+    sequence of the cells.
+    """
+    def __init__(self, shape):
+        self.shape = shape
+        self.probes = 0
+        self.reads = 0
+        self.bytes = 0
+
+    def cell(self, i, j):
+        return self.row(i, j, j)[0]
+
+class ArrayMatrix(Matrix):
+    """Matrix on a 2-D numpy array, a np.memmap only loads the pages of
+    the probed rows and columns. Counted like BinaryMatrix: a span along
+    the stored order(the axis whose stride is one item) is one read, a
+    span across it is a read per cell
+    """
+    def __init__(self, a):
+        super().__init__(a.shape)
+        self.a = a
+
+    def _count(self, axis, lo, hi):
+        self.probes += hi - lo + 1
+        self.bytes += (hi - lo + 1) * self.a.itemsize
+        if abs(self.a.strides[axis]) == self.a.itemsize:
+            self.reads += 1
+        else:
+            self.reads += hi - lo + 1
+
+    def row(self, i, lo, hi):
+        self._count(1, lo, hi)
+        return self.a[i, lo:hi + 1]
+
+    def col(self, j, lo, hi):
+        self._count(0, lo, hi)
+        return self.a[lo:hi + 1, j]
+
+    def cell(self, i, j):
+        self._count(1, j, j)
+        return self.a[i, j]
+
+class CellMatrix(Matrix):
+    """Matrix on any object with a cell(i, j) method, every cell is a read"""
+    def __init__(self, cells, shape):
+        super().__init__(shape)
+        self.cells = cells
+
+    def row(self, i, lo, hi):
+        self.probes += hi - lo + 1
+        self.reads += hi - lo + 1
+        return [self.cells.cell(i, j) for j in range(lo, hi + 1)]
+
+    def col(self, j, lo, hi):
+        self.probes += hi - lo + 1
+        self.reads += hi - lo + 1
+        return [self.cells.cell(i, j) for i in range(lo, hi + 1)]
+
+    def cell(self, i, j):
+        self.probes += 1
+        self.reads += 1
+        return self.cells.cell(i, j)
+
+class BinaryMatrix(Matrix):
+    """Matrix stored in a raw binary file from offset, in row-major('C')
+    or column-major('F') order. A span along the stored order is one
+    contiguous read, a span across it is a read per cell
+    """
+    def __init__(self, path, shape, dtype='<f8', order='C', offset=0):
+        import numpy as np
+        super().__init__(shape)
+        self.dtype = np.dtype(dtype)
+        self.order = order
+        self.offset = offset
+        self.fd = os.open(path, os.O_RDONLY)
+
+    def close(self):
+        os.close(self.fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read(self, pos, count):
+        """count cells from the cell pos in stored order"""
+        import numpy as np
+        size = self.dtype.itemsize
+        buf = os.pread(self.fd, count * size, self.offset + pos * size)
+        self.reads += 1
+        self.bytes += len(buf)
+        return np.frombuffer(buf, dtype=self.dtype)
+
+    def _span(self, line, lo, hi, along):
+        import numpy as np
+        self.probes += hi - lo + 1
+        n = self.shape[1] if self.order == 'C' else self.shape[0]
+        if along:
+            return self._read(line * n + lo, hi - lo + 1)
+        return np.concatenate([self._read(k * n + line, 1)
+                               for k in range(lo, hi + 1)])
+
+    def row(self, i, lo, hi):
+        return self._span(i, lo, hi, self.order == 'C')
+
+    def col(self, j, lo, hi):
+        return self._span(j, lo, hi, self.order == 'F')
+
+def _as_matrix(a):
+    if isinstance(a, Matrix):
+        return a
+    if hasattr(a, 'cell'):
+        return CellMatrix(a, a.shape)
+    # numpy is only imported here, so find_minimum and Matrix readers that
+    # don't need it never pay for it
+    import numpy as np
+    return ArrayMatrix(np.asarray(a))
+
+def _argmin(line):
+    if hasattr(line, 'argmin'):
+        return int(line.argmin())
+    return min(range(len(line)), key=line.__getitem__)
+
+def _cross_min(m, top, left, bottom, right):
+    """(i, j, value) of the minimum on rows top, mid, bottom and columns
+    left, mid, right of the region
+    """
+    midrow = (top + bottom) // 2
+    midcol = (left + right) // 2
+    minij = None
+    for i in (top, midrow, bottom):
+        line = m.row(i, left, right)
+        k = _argmin(line)
+        if minij is None or line[k] < minij[2]:
+            minij = (i, left + k, line[k])
+    for j in (left, midcol, right):
+        line = m.col(j, top, bottom)
+        k = _argmin(line)
+        if line[k] < minij[2]:
+            minij = (top + k, j, line[k])
+    return minij
+
+def _smaller_neighbour(m, i, j, value):
+    """(i, j, value) of the smallest neighbour of (i, j) if it's smaller
+    than value
+    """
+    minij = (i, j, value)
+    for l in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+        if 0 <= l[0] < m.shape[0] and 0 <= l[1] < m.shape[1]:
+            v = m.cell(*l)
+            if v < minij[2]:
+                minij = (l[0], l[1], v)
+    return None if minij[:2] == (i, j) else minij
+
+def local_minimum(a):
+    """(i, j) of a local minimum of an M * N matrix, same divide and
+    conquer as find_minimum but without recursion. a is a Matrix, an object
+    with shape and cell(i, j), or a numpy array(or anything np.asarray
+    accepts). Only O(M + N) cells are read, which a Matrix counts.
+
+    best is a cell inside the region smaller than every cell on the region
+    border, so a local minimum of the region is one of the matrix. When
+    the cross has a smaller cell than best, best is replaced by its
+    smaller neighbour, or it's the answer.
+    """
+    m = _as_matrix(a)
+    if len(m.shape) != 2 or 0 in m.shape:
+        raise ValueError(f'expected a nonempty M * N matrix, got shape '
+                         f'{tuple(m.shape)}')
+    top, left, bottom, right = 0, 0, m.shape[0] - 1, m.shape[1] - 1
+    best = None
+    while bottom - top > 2 and right - left > 2:
+        i, j, value = _cross_min(m, top, left, bottom, right)
+        if best is None or not best[2] < value:
+            best = _smaller_neighbour(m, i, j, value)
+            if best is None:
+                return i, j
+
+        midrow = (top + bottom) // 2
+        midcol = (left + right) // 2
+        if best[0] < midrow:
+            bottom = midrow
+        else:
+            top = midrow
+        if best[1] < midcol:
+            right = midcol
+        else:
+            left = midcol
+
+    # a thin region, scanning it is no more than scanning a cross. Scan
+    # along the short side but keep the first minimum in row-major order
+    minij = None
+    if bottom - top <= right - left:
+        for i in range(top, bottom + 1):
+            line = m.row(i, left, right)
+            k = _argmin(line)
+            if minij is None or (line[k], i, left + k) < minij:
+                minij = (line[k], i, left + k)
+    else:
+        for j in range(left, right + 1):
+            line = m.col(j, top, bottom)
+            k = _argmin(line)
+            if minij is None or (line[k], top + k, j) < minij:
+                minij = (line[k], top + k, j)
+    return minij[1], minij[2]
+
+def _gather(a, ks, rows, cols):
+    """a[ks[x], rows[x, r], cols[x, c]] of shape(len(ks), R, C)"""
+    return a[ks[:, None, None], rows[:, :, None], cols[:, None, :]]
+
+def _spans(start, stop):
+    """start[x]..stop[x] of every x padded to the longest one by repeating
+    stop[x], repeated cells don't change the first argmin
+    """
+    import numpy as np
+    return np.minimum(start[:, None] + np.arange((stop - start).max() + 1),
+                      stop[:, None])
+
+def local_minima(a):
+    """local_minimum of every matrix in a K * M * N array, all matrices go
+    through the same loop together, return a K * 2 array of (i, j)
+    """
+    import numpy as np
+    a = np.asarray(a)
+    if a.ndim != 3 or 0 in a.shape[1:]:
+        raise ValueError(f'expected K nonempty M * N matrices, got shape '
+                         f'{a.shape}')
+    K, M, N = a.shape
+    top = np.zeros(K, dtype=np.intp)
+    left = np.zeros(K, dtype=np.intp)
+    bottom = np.full(K, M - 1, dtype=np.intp)
+    right = np.full(K, N - 1, dtype=np.intp)
+    bi = np.zeros(K, dtype=np.intp)
+    bj = np.zeros(K, dtype=np.intp)
+    has_best = np.zeros(K, dtype=bool)
+    ret = np.zeros((K, 2), dtype=np.intp)
+    ks = np.arange(K)
+
+    while len(ks):
+        thin = (bottom[ks] - top[ks] <= 2) | (right[ks] - left[ks] <= 2)
+        if thin.any():
+            x = ks[thin]
+            rows = _spans(top[x], bottom[x])
+            cols = _spans(left[x], right[x])
+            block = _gather(a, x, rows, cols).reshape(len(x), -1)
+            i, j = np.divmod(block.argmin(axis=1), cols.shape[1])
+            ret[x, 0] = rows[np.arange(len(x)), i]
+            ret[x, 1] = cols[np.arange(len(x)), j]
+            ks = ks[~thin]
+            if not len(ks):
+                break
+
+        t, l, b, r = top[ks], left[ks], bottom[ks], right[ks]
+        midrow = (t + b) // 2
+        midcol = (l + r) // 2
+        n = np.arange(len(ks))
+
+        # the cross, rows first like _cross_min
+        rows3 = np.stack([t, midrow, b], axis=1)
+        cols = _spans(l, r)
+        hline = _gather(a, ks, rows3, cols).reshape(len(ks), -1)
+        x = hline.argmin(axis=1)
+        i = rows3[n, x // cols.shape[1]]
+        j = cols[n, x % cols.shape[1]]
+        value = hline[n, x]
+        cols3 = np.stack([l, midcol, r], axis=1)
+        rows = _spans(t, b)
+        vline = _gather(a, ks, rows, cols3).transpose(0, 2, 1)
+        vline = vline.reshape(len(ks), -1)
+        x = vline.argmin(axis=1)
+        smaller = vline[n, x] < value
+        i = np.where(smaller, rows[n, x % rows.shape[1]], i)
+        j = np.where(smaller, cols3[n, x // rows.shape[1]], j)
+        value = np.where(smaller, vline[n, x], value)
+
+        # smallest neighbour, cells outside count as a[i, j]
+        ni, nj, nvalue = i, j, value
+        for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            li, lj = i + di, j + dj
+            inside = (0 <= li) & (li < M) & (0 <= lj) & (lj < N)
+            lvalue = a[ks, np.clip(li, 0, M - 1), np.clip(lj, 0, N - 1)]
+            smaller = inside & (lvalue < nvalue)
+            ni = np.where(smaller, li, ni)
+            nj = np.where(smaller, lj, nj)
+            nvalue = np.where(smaller, lvalue, nvalue)
+
+        keep = has_best[ks] & (a[ks, bi[ks], bj[ks]] < value)
+        found = ~keep & (nvalue == value)
+        ret[ks[found], 0] = i[found]
+        ret[ks[found], 1] = j[found]
+        bi[ks] = np.where(keep, bi[ks], ni)
+        bj[ks] = np.where(keep, bj[ks], nj)
+        has_best[ks] = True
+
+        up = bi[ks] < midrow
+        bottom[ks] = np.where(up, midrow, b)
+        top[ks] = np.where(up, t, midrow)
+        west = bj[ks] < midcol
+        right[ks] = np.where(west, midcol, r)
+        left[ks] = np.where(west, l, midcol)
+        ks = ks[~found]
+    return ret
+
+class BowlCells:
+    """M * N bowl computed on probing, never stored. Its only local minimum
+    is center, which by default is off every cross the search lays, so
+    local_minimum goes through all the levels until the region is thin
+    and the probes add up to the whole geometric sum
+    """
+    def __init__(self, shape, center=None):
+        self.shape = shape
+        if center is None:
+            center = (int(shape[0] * 0.3183), int(shape[1] * 0.7071))
+        self.center = center
+
+    def cell(self, i, j):
+        return (i - self.center[0]) ** 2 + (j - self.center[1]) ** 2
+
+def report_probes(m):
+    """find a local minimum of the Matrix m and print how much of it was
+    read
+    """
+    i, j = local_minimum(m)
+    M, N = m.shape
+    print(f'{M} * {N}: {(i, j)}, probes {m.probes}, reads {m.reads}, '
+          f'bytes {m.bytes}, probes / (M + N) {m.probes / (M + N):.2f}')
@@ -0,0 +1,249 @@
+"""Per-operation latency and allocation benchmarks of the real-time queues
+in seven_stacks_queue, kept apart so importing them stays cheap
+"""
+
+import functools
+import gc
+import sys
+import time
+import tracemalloc
+from collections import Counter, deque
+
+from .seven_stacks_queue import (
+    Deque, PersistentQueue, PersistentStack, Queue, Stack)
+
+class TwoStackQueue:
+    """Textbook queue with amortized O(1) operations, dequeue reverses the
+    whole inbox into outbox when outbox runs out. Only used as a baseline
+    in benchmark()
+    """
+    def __init__(self):
+        self.inbox = []
+        self.outbox = []
+
+    def enqueue(self, v):
+        self.inbox.append(v)
+
+    def dequeue(self):
+        if not self.outbox:
+            while self.inbox:
+                self.outbox.append(self.inbox.pop())
+        return self.outbox.pop()
+
+def _pattern(name, n):
+    """return a list of operation indexes, 0 for enqueue and 1 for dequeue.
+    Every pattern leaves the queue empty at the end
+    """
+    if name == 'fifo':
+        # fill then drain, the first dequeue hits the whole transfer
+        return [0] * n + [1] * n
+    if name == 'steady':
+        # keep about n elements queued, TwoStackQueue transfers n elements
+        # every n operations
+        return [0] * n + [0, 1] * n + [1] * n
+    if name == 'sawtooth':
+        # bursts of doubling size, a single dequeue after each burst forces
+        # a long transfer, then the queue is refilled and drained
+        ops = []
+        size = 1
+        while size <= n:
+            ops += [0] * size + [1] + [0] * size
+            ops += [1] * (2 * size - 1)
+            size *= 2
+        return ops
+    raise ValueError(f'unknown pattern {name}')
+
+def _deque_pattern(name, n):
+    """return a list of operation indexes, 0 push_front, 1 push_back,
+    2 pop_front and 3 pop_back. Every pattern leaves the deque empty
+    """
+    if name == 'queue':
+        # everything crosses from the rear to the front
+        return [1] * n + [2] * n
+    if name == 'stack':
+        # pops only hit the side that was never pushed
+        return [0] * n + [3] * n
+    if name == 'steady':
+        # about n elements, draining alternately from both ends
+        return [1] * n + [1, 2] * n + [0, 3] * n + [2, 3] * (n // 2)
+    raise ValueError(f'unknown pattern {name}')
+
+def _run(ops, pattern):
+    """call ops[i] for i in pattern, return the latency of every call in
+    nanoseconds
+    """
+    clock = time.perf_counter_ns
+    samples = []
+    record = samples.append
+    for i in pattern:
+        op = ops[i]
+        t0 = clock()
+        op()
+        t1 = clock()
+        record(t1 - t0)
+    return samples
+
+def _counting(cls, counter):
+    """replace cls.__init__ by one counting constructions, return the old
+    one
+    """
+    init = cls.__init__
+    def __init__(self, *args):
+        counter[cls.__name__] += 1
+        init(self, *args)
+    cls.__init__ = __init__
+    return init
+
+def _allocations(ops, pattern):
+    """return (Stack and PersistentStack objects constructed, peak of
+    allocated memory blocks above the start, tracemalloc peak in bytes)
+    of a run, make_ops() is called inside so its stacks are counted
+    """
+    counter = Counter()
+    inits = {cls: _counting(cls, counter) for cls in (Stack, PersistentStack)}
+    try:
+        getblocks = sys.getallocatedblocks
+        ops = ops()
+        start = getblocks()
+        blocks = 0
+        for i in pattern:
+            ops[i]()
+            b = getblocks() - start
+            if b > blocks:
+                blocks = b
+    finally:
+        for cls, init in inits.items():
+            cls.__init__ = init
+
+    # tracing slows every allocation down, so it gets its own run
+    tracemalloc.start()
+    for i in pattern:
+        ops[i]()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sum(counter.values()), blocks, peak
+
+def _report(impls, patterns):
+    """impls are (label, function returning fresh ops), patterns are
+    (name, pattern). Print latency percentiles(ns) of every pair.
+
+    Allocations are measured in later runs so that counting does not
+    distort the latencies: stacks counts Stack(and PersistentStack)
+    objects constructed including the initial ones, blocks is the peak
+    of sys.getallocatedblocks() above the start, i.e. live small objects
+    like nodes and tuples(big list buffers are not blocks), peak is the
+    tracemalloc peak in KiB.
+    """
+    print(f'{"pattern":<10}{"impl":<17}{"ops":>9}{"p50":>8}{"p99":>8}'
+          f'{"p99.9":>9}{"max":>11}{"stacks":>9}{"blocks":>9}{"peak":>9}')
+    for name, pattern in patterns:
+        for label, make_ops in impls:
+            samples = sorted(_run(make_ops(), pattern))
+            p50, p99, p999 = (samples[min(len(samples) - 1,
+                                          int(len(samples) * p))]
+                              for p in (0.5, 0.99, 0.999))
+            stacks, blocks, peak = _allocations(make_ops, pattern)
+            print(f'{name:<10}{label:<17}{len(samples):>9}{p50:>8}{p99:>8}'
+                  f'{p999:>9}{samples[-1]:>11}{stacks:>9}{blocks:>9}'
+                  f'{peak >> 10:>9}')
+
+def _max_report(impls, patterns, repeat=3):
+    """impls are (label, function returning fresh ops), patterns are
+    (N, pattern). Print the slowest call(ns) of every impl against N, a
+    worst-case O(1) operation stays flat as N grows. The gc is off and the
+    pattern runs repeat times on fresh ops, every call is timed as its best
+    run: a call doing O(N) work is slow in all of them while a preempted
+    one is not. Stack is a list, whose append() and pop() now and then
+    resize it by a realloc that may copy it, so what remains of the growth
+    of Queue and Deque is the one a bare list shows
+    """
+    print(f'{"N":>9}' + ''.join(f'{label:>17}' for label, _ in impls))
+    for n, pattern in patterns:
+        row = f'{n:>9}'
+        for _, make_ops in impls:
+            enabled = gc.isenabled()
+            gc.disable()
+            try:
+                best = _run(make_ops(), pattern)
+                for _ in range(repeat - 1):
+                    best = list(map(min, best, _run(make_ops(), pattern)))
+            finally:
+                if enabled:
+                    gc.enable()
+            row += f'{max(best):>17}'
+        print(row)
+
+def _ops(q, *names):
+    """bound methods of q, methods ending with a push get 0 as argument"""
+    return [functools.partial(getattr(q, name), 0)
+            if name in ('enqueue', 'append', 'appendleft', 'push_front',
+                        'push_back')
+            else getattr(q, name)
+            for name in names]
+
+def _versioned_ops(empty, put, get):
+    """ops keeping every new version in a cell, put(version) and
+    get(version) return the new version
+    """
+    cell = [empty]
+    def enqueue():
+        cell[0] = put(cell[0])
+    def dequeue():
+        cell[0] = get(cell[0])
+    return [enqueue, dequeue]
+
+def _snapshot_put(d):
+    d = deque(d)
+    d.append(0)
+    return d
+
+def _snapshot_get(d):
+    d = deque(d)
+    d.popleft()
+    return d
+
+def _sizes(n):
+    """1024, 2048, ... up to n"""
+    size = 1 << 10
+    while size <= n:
+        yield size
+        size <<= 1
+
+_QUEUES = [('Queue', lambda: _ops(Queue(), 'enqueue', 'dequeue')),
+           ('TwoStackQueue',
+            lambda: _ops(TwoStackQueue(), 'enqueue', 'dequeue')),
+           ('deque', lambda: _ops(deque(), 'append', 'popleft'))]
+
+_DEQUES = [('Deque', lambda: _ops(Deque(), 'push_front', 'push_back',
+                                  'pop_front', 'pop_back')),
+           ('deque', lambda: _ops(deque(), 'appendleft', 'append',
+                                  'popleft', 'pop'))]
+
+def benchmark(n=1 << 16, patterns=('fifo', 'steady', 'sawtooth')):
+    """compare Queue, TwoStackQueue and collections.deque, then the slowest
+    fill-then-drain call against N
+    """
+    _report(_QUEUES, [(name, _pattern(name, n)) for name in patterns])
+    _max_report(_QUEUES, [(size, _pattern('fifo', size))
+                          for size in _sizes(n)])
+
+def benchmark_deque(n=1 << 16, patterns=('queue', 'stack', 'steady')):
+    """compare Deque and collections.deque, then the slowest call moving
+    everything from the rear to the front against N
+    """
+    _report(_DEQUES, [(name, _deque_pattern(name, n)) for name in patterns])
+    _max_report(_DEQUES, [(size, _deque_pattern('queue', size))
+                          for size in _sizes(n)])
+
+def benchmark_persistent(n=1 << 10, patterns=('fifo', 'steady', 'sawtooth')):
+    """every operation keeps a new version, compare PersistentQueue and
+    copying a collections.deque on each version
+    """
+    _report([('PersistentQueue',
+              lambda: _versioned_ops(PersistentQueue(),
+                                     lambda q: q.enqueue(0),
+                                     lambda q: q.dequeue()[1])),
+             ('deque snapshot',
+              lambda: _versioned_ops(deque(), _snapshot_put,
+                                     _snapshot_get))],
+            [(name, _pattern(name, n)) for name in patterns])
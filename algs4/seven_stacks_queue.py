@@ -0,0 +1,498 @@
+class Stack:
+    def __init__(self):
+        self.s = []
+
+    def push(self, v):
+        self.s.append(v)
+
+    def pop(self):
+        return self.s.pop()
+
+    def push_many(self, vs):
+        self.s.extend(vs)
+
+    def pop_many(self, k):
+        """pop k elements, return them in popped order"""
+        if k <= 0:
+            return []
+        vs = self.s[-k:]
+        del self.s[-k:]
+        vs.reverse()
+        return vs
+
+    def __bool__(self):
+        return not not self.s
+
+    def __len__(self):
+        return len(self.s)
+
+    def clear(self):
+        self.s.clear()
+
+    def copy(self):
+        s = Stack()
+        s.s = self.s.copy()
+        return s
+
+    def __str__(self):
+        return str(self.s)
+
+class PersistentStack:
+    """Stack on immutable linked nodes, copy() is O(1) because the copies
+    share nodes, and pushing or popping one copy leaves the others intact
+    """
+    def __init__(self):
+        self.node = None    # (value, next node)
+        self.n = 0
+
+    def push(self, v):
+        self.node = (v, self.node)
+        self.n += 1
+
+    def pop(self):
+        if self.node is None:
+            raise IndexError('pop from empty stack')
+        v, self.node = self.node
+        self.n -= 1
+        return v
+
+    def push_many(self, vs):
+        for v in vs:
+            self.push(v)
+
+    def pop_many(self, k):
+        return [self.pop() for _ in range(min(k, self.n))]
+
+    def copy(self):
+        s = PersistentStack()
+        s.node = self.node
+        s.n = self.n
+        return s
+
+    def __bool__(self):
+        return self.node is not None
+
+    def __len__(self):
+        return self.n
+
+    def clear(self):
+        self.node = None
+        self.n = 0
+
+    def __str__(self):
+        vs = []
+        node = self.node
+        while node is not None:
+            vs.append(node[0])
+            node = node[1]
+        vs.reverse()
+        return str(vs)
+
+class Queue:
+    def __init__(self, stack=Stack):
+        self.H = stack()
+        self.T = stack()
+        self.H1 = stack()
+        self.HR = stack()
+        self.T1 = stack()
+        self.h = stack()
+        self.h1 = stack()
+        # HR and h of the last copy, their stale elements are popped a few
+        # per operation instead of all when the copy finishes
+        self.HR0 = stack()
+        self.h0 = stack()
+        self.deleted = 0
+
+    def copy(self):
+        """a Queue with the same elements, every attribute with a copy()
+        (the stacks) is copied by it, so the copy is O(1) on PersistentStack
+        and no attribute is ever left out
+        """
+        q = type(self).__new__(type(self))
+        for name, v in vars(self).items():
+            setattr(q, name, v.copy() if hasattr(v, 'copy') else v)
+        return q
+
+    def enqueue(self, v):
+        self._drop(1)
+        if self._copy():
+            self.T1.push(v)
+        else:
+            self.T.push(v)
+
+    def dequeue(self):
+        self._drop(1)
+        if self._copy():
+            self.deleted += 1
+            return self.h.pop()
+        else:
+            self.h.pop()
+            return self.H.pop()
+
+    def enqueue_many(self, iterable):
+        """same as enqueue every element of iterable in order, but the
+        elements and copy steps are moved in runs with list slicing
+        """
+        vs = list(iterable)
+        i = 0
+        while i < len(vs):
+            if self._copying():
+                k = self._copy_steps(len(vs) - i, False)
+                self.T1.push_many(vs[i:i + k])
+            else:
+                # T can grow until it is longer than H
+                k = len(self.H) + 1 - len(self.T)
+                self.T.push_many(vs[i:i + k])
+            self._drop(k)
+            if k == 0:
+                self.enqueue(vs[i])
+                k = 1
+            i += k
+
+    def dequeue_many(self, n):
+        """same as dequeue n times, return the elements in a list"""
+        ret = []
+        while len(ret) < n:
+            if self._copying():
+                k = self._copy_steps(n - len(ret), True)
+                ret += self.h.pop_many(k)
+            else:
+                # popping H must not make T longer than H
+                k = min(n - len(ret), len(self.H),
+                        len(self.H) + 1 - len(self.T))
+                ret += self.H.pop_many(k)
+                self.h.pop_many(k)
+            self._drop(k)
+            if k == 0:
+                ret.append(self.dequeue())
+        return ret
+
+    def debug(self):
+        print('---inner status---')
+        print(f'self.T: {self.T}')
+        print(f'self.H: {self.H}')
+        print(f'self.T1: {self.T1}')
+        print(f'self.H1: {self.H1}')
+        print(f'self.HR: {self.HR}')
+        print(f'self.h: {self.h}')
+        print(f'self.h1: {self.h1}')
+        print(f'self.HR0: {self.HR0}')
+        print(f'self.h0: {self.h0}')
+        print(f'self.deleted: {self.deleted}')
+        print('---inner status end---')
+
+    def _copying(self):
+        return len(self.T) >= len(self.H) + 1 or not not self.HR
+
+    def _copy(self):
+        if not self._copying():
+            return False
+
+        # self._copy_step()
+        status = self._copy_step()
+        if status == False:
+            # T and H are drained by now, so swap them with T1 and H1
+            # instead of allocating fresh stacks. HR and the old h may still
+            # hold up to len(H) deleted elements, clearing them here would
+            # make this operation O(n), so they are parked in HR0 and h0
+            # which _drop() has emptied by now
+            self.T, self.T1 = self.T1, self.T
+            self.H, self.H1 = self.H1, self.H
+            self.HR, self.HR0 = self.HR0, self.HR
+            self.h, self.h1, self.h0 = self.h1, self.h0, self.h
+            self.deleted = 0
+        return status
+
+    def _drop(self, k):
+        """pop k stale elements from HR0 and from h0, k is the number of
+        operations run. A copy that starts with m elements in H leaves at
+        most m in each of them, and the next copy can't finish before every
+        element of the new H, at least m + 1, is dequeued or moved, each by
+        its own operation, so one per operation empties them in time
+        """
+        if self.HR0:
+            self.HR0.pop_many(k)
+        if self.h0:
+            self.h0.pop_many(k)
+
+    def _copy_step(self):
+        '''copy finished return False else True'''
+        if self.T:
+            v = self.T.pop()
+            self.H1.push(v)
+            self.h1.push(v)
+        if self.H:
+            self.HR.push(self.H.pop())
+        if not self.T and not self.H:
+            if len(self.HR) <= self.deleted:
+                return False
+            else:
+                v = self.HR.pop()
+                self.H1.push(v)
+                self.h1.push(v)
+                if len(self.HR) <= self.deleted:
+                    return False
+                else:
+                    return True
+        else:
+            return True
+
+    def _copy_steps(self, k, dequeuing):
+        """run at most k _copy_step() in bulk, stop before the step that may
+        finish the copy and leave it to enqueue()/dequeue(). If dequeuing,
+        every step is followed by a deletion from h. Return the number of
+        steps run
+        """
+        if self.T or self.H:
+            # 1) and 2), 3) is only reached when both T and H are drained
+            k = min(k, max(len(self.T), len(self.H)) - 1)
+            if k <= 0:
+                return 0
+            vs = self.T.pop_many(k)
+            self.H1.push_many(vs)
+            self.h1.push_many(vs)
+            self.HR.push_many(self.H.pop_many(k))
+        else:
+            # 3), a step finishes the copy once len(HR) <= deleted and a
+            # deletion also closes the gap by one
+            gap = len(self.HR) - self.deleted
+            k = min(k, (gap - 1) // 2 if dequeuing else gap - 1)
+            if k <= 0:
+                return 0
+            vs = self.HR.pop_many(k)
+            self.H1.push_many(vs)
+            self.h1.push_many(vs)
+        if dequeuing:
+            self.deleted += k
+        return k
+
+class PersistentQueue:
+    """Queue whose versions never change: enqueue() returns the new version
+    and dequeue() returns the element with the new version. It's a Queue on
+    PersistentStack, a new version only copies the 9 stack headers and
+    shares their nodes with the old one, so every operation is still
+    worst-case O(1)
+    """
+    def __init__(self, q=None):
+        self.q = Queue(PersistentStack) if q is None else q
+
+    def enqueue(self, v):
+        q = self.q.copy()
+        q.enqueue(v)
+        return PersistentQueue(q)
+
+    def dequeue(self):
+        q = self.q.copy()
+        return q.dequeue(), PersistentQueue(q)
+
+    def enqueue_many(self, iterable):
+        q = self.q.copy()
+        q.enqueue_many(iterable)
+        return PersistentQueue(q)
+
+    def dequeue_many(self, n):
+        q = self.q.copy()
+        return q.dequeue_many(n), PersistentQueue(q)
+
+class Deque:
+    """Deque built from stacks, every operation runs O(1) stack operations
+    in the worst case.
+
+    Side 0 is the front and side 1 is the rear. Each side is a top stack t
+    on a base stack b, with the end element on top and the bottoms of both
+    sides meeting in the middle, and every stack has a copy(tc, bc).
+
+    When a side gets more than 3 times(+1) bigger than the other, k elements
+    at the bottom of the big side are moved under the small side. Like
+    Queue._copy, the move runs a few steps on each following operation: it
+    pops t and b of both sides, reversing them into r, and builds the new
+    base b1 with its copy b1c. Meanwhile pushes go to the new top t1, pops
+    are served from the copies and counted in deleted, the deleted elements
+    are skipped when r is popped into b1. The old copies and r still hold
+    elements when the move finishes, they are parked in tc0, bc0 and r0 and
+    popped 2 * STEPS at a time by the following operations: each holds at
+    most l elements and the next move can't finish in less than l / 2
+    steps, so they are empty by then.
+    """
+    STEPS = 8   # move steps per operation, enough to finish the move
+                # before the small side runs out
+    SYNC = 32   # smaller deques finish the move at once
+
+    def __init__(self):
+        self.t = [Stack(), Stack()]
+        self.b = [Stack(), Stack()]
+        self.tc = [Stack(), Stack()]
+        self.bc = [Stack(), Stack()]
+        # following are only used while moving
+        self.t1 = [Stack(), Stack()]
+        self.t1c = [Stack(), Stack()]
+        self.b1 = [Stack(), Stack()]
+        self.b1c = [Stack(), Stack()]
+        self.r = [Stack(), Stack()]
+        # stale stacks of the last move
+        self.tc0 = [Stack(), Stack()]
+        self.bc0 = [Stack(), Stack()]
+        self.r0 = [Stack(), Stack()]
+        self.parked = False
+        self.deleted = [0, 0]
+        self.limit = [0, 0] # the copy can serve this many pops
+        self.big = 0
+        self.k = 0
+        self.moving = False
+        self.n = 0
+
+    def __len__(self):
+        return self.n
+
+    def push_front(self, v):
+        self._push(0, v)
+
+    def push_back(self, v):
+        self._push(1, v)
+
+    def pop_front(self):
+        return self._pop(0)
+
+    def pop_back(self):
+        return self._pop(1)
+
+    def _push(self, i, v):
+        if self.parked:
+            self._drop(2 * self.STEPS)
+        self.n += 1
+        if self.moving:
+            self.t1[i].push(v)
+            self.t1c[i].push(v)
+            self._move(self.STEPS)
+        else:
+            self.t[i].push(v)
+            self.tc[i].push(v)
+            self._check()
+
+    def _pop(self, i):
+        if self.n == 0:
+            raise IndexError('pop from empty deque')
+        if self.parked:
+            self._drop(2 * self.STEPS)
+
+        if not self.moving:
+            if not self.t[i] and not self.b[i]:
+                i = 1 - i   # the other side holds the only element
+            self._pop_side(self.tc[i], self.bc[i])
+            v = self._pop_side(self.t[i], self.b[i])
+            self.n -= 1
+            self._check()
+            return v
+
+        if self.t1[i]:
+            self.t1c[i].pop()
+            v = self.t1[i].pop()
+        elif self._settled(i) and self.b1[i]:
+            self.b1c[i].pop()
+            v = self.b1[i].pop()
+        elif not self._settled(i) and self.deleted[i] < self.limit[i]:
+            self.deleted[i] += 1
+            v = self._pop_side(self.tc[i], self.bc[i])
+        else:
+            # the side ran out before the move finished, STEPS and SYNC
+            # keep this from happening
+            self._move(None)
+            return self._pop(i)
+        self.n -= 1
+        self._move(self.STEPS)
+        return v
+
+    def _pop_side(self, t, b):
+        if t:
+            return t.pop()
+        return b.pop()
+
+    def _size(self, i):
+        return len(self.t[i]) + len(self.b[i])
+
+    def _check(self):
+        big = 0 if self._size(0) > self._size(1) else 1
+        l, s = self._size(big), self._size(1 - big)
+        if l <= 3 * s + 1:
+            return
+
+        self.big = big
+        self.k = (l - s) // 2
+        self.limit[big] = l - self.k
+        self.limit[1 - big] = s
+        self.deleted = [0, 0]
+        self.moving = True
+        self._move(None if self.n < self.SYNC else self.STEPS)
+
+    def _settled(self, i):
+        """whether the new base of side i is complete"""
+        return (not (self.t[0] or self.b[0] or self.t[1] or self.b[1])
+                and len(self.r[i]) <= self.deleted[i])
+
+    def _move(self, steps):
+        """run steps(None means all) _move_step(), finish the move if it's
+        done"""
+        while steps is None or steps > 0:
+            if self._move_step():
+                self._finish_move()
+                self._check()
+                return
+            if steps is not None:
+                steps -= 1
+
+    def _move_step(self):
+        '''move finished return True else False'''
+        B, S = self.big, 1 - self.big
+        if self.t[B] or self.b[B] or self.t[S] or self.b[S]:
+            # 1) the top l - k elements of the big side are reversed into
+            # r, the bottom k go to the new base of the small side
+            if self.t[B] or self.b[B]:
+                v = self._pop_side(self.t[B], self.b[B])
+                if self._size(B) >= self.k:
+                    self.r[B].push(v)
+                else:
+                    self.b1[S].push(v)
+                    self.b1c[S].push(v)
+            # 2) the small side is reversed into r
+            if self.t[S] or self.b[S]:
+                self.r[S].push(self._pop_side(self.t[S], self.b[S]))
+            return False
+
+        # 3) pop r into the new bases, until the deleted ones are left
+        for i in (0, 1):
+            if len(self.r[i]) > self.deleted[i]:
+                v = self.r[i].pop()
+                self.b1[i].push(v)
+                self.b1c[i].push(v)
+        return (len(self.r[0]) <= self.deleted[0]
+                and len(self.r[1]) <= self.deleted[1])
+
+    def _drop(self, k):
+        """pop k stale elements from every parked stack"""
+        parked = False
+        for stacks in (self.tc0, self.bc0, self.r0):
+            for s in stacks:
+                if s:
+                    s.pop_many(k)
+                    parked = parked or not not s
+        self.parked = parked
+
+    def _finish_move(self):
+        if self.parked:
+            # only when a pop forced the move to finish early
+            for stacks in (self.tc0, self.bc0, self.r0):
+                for s in stacks:
+                    s.clear()
+        for i in (0, 1):
+            # t and b are drained, reuse them for the next move; tc, bc
+            # and r are parked instead of cleared, which would free up to n
+            # elements in this operation
+            self.t[i], self.t1[i] = self.t1[i], self.t[i]
+            self.b[i], self.b1[i] = self.b1[i], self.b[i]
+            self.tc[i], self.t1c[i], self.tc0[i] = (
+                self.t1c[i], self.tc0[i], self.tc[i])
+            self.bc[i], self.b1c[i], self.bc0[i] = (
+                self.b1c[i], self.bc0[i], self.bc[i])
+            self.r[i], self.r0[i] = self.r0[i], self.r[i]
+        self.parked = True
+        self.moving = False
@@ -0,0 +1,105 @@
+import sys
+from collections import deque
+
+_END = object()
+
+def is_valid(l):
+    return first_invalid(l, range(len(l))) == -1
+
+def first_invalid(pops, pushes=None):
+    """pops and pushes are iterables(could be streams) of distinct values,
+    return the position of the first element in pops that can't be popped,
+    len(pops) if pushed elements are left at the end, or -1 if pops is a
+    pop order of pushes.
+
+    Only the stack is kept in memory. pushes defaults to 0, 1, 2, ... with
+    no end, then a value that was pushed but is not on top fails at once,
+    but a value beyond the length of pops is only found at the end.
+    """
+    s = deque()
+    pos = -1
+    if pushes is None:
+        i = 0
+        for pos, out in enumerate(pops):
+            if s and s[-1] == out:
+                s.pop()
+                continue
+            if out < i:
+                return pos
+            s.extend(range(i, out)) # push i..out and pop out at once
+            i = out + 1
+        return -1 if not s else pos + 1
+
+    pushes = iter(pushes)
+    for pos, out in enumerate(pops):
+        while not s or s[-1] != out:
+            v = next(pushes, _END)
+            if v is _END:
+                return pos
+            s.append(v)
+        s.pop()
+    if s or next(pushes, _END) is not _END:
+        return pos + 1
+    return -1
+
+def read_ints(f, size=1 << 16):
+    """yield whitespace separated integers of a text stream, reading it in
+    chunks so a long line is not loaded at once
+    """
+    rest = ''
+    while True:
+        chunk = f.read(size)
+        if not chunk:
+            break
+        words = (rest + chunk).split()
+        # the last word may continue in the next chunk
+        rest = words.pop() if words and not chunk[-1].isspace() else ''
+        for w in words:
+            yield int(w)
+    if rest:
+        yield int(rest)
+
+def _first_invalid_perm(p):
+    return first_invalid(p, range(len(p)))
+
+def _first_invalid_rows(a):
+    """first_invalid_many for a 2-D array, every row is checked at once per
+    column. The unpopped values of a row form a doubly linked list(shifted
+    by 1, so 0 and n + 1 are sentinels), the top of the stack is always the
+    unpopped value right before the last popped one
+    """
+    import numpy as np
+    rows, n = a.shape
+    r = np.arange(rows)
+    prev = np.tile(np.arange(-1, n + 1), (rows, 1))
+    nxt = np.tile(np.arange(1, n + 3), (rows, 1))
+    top = np.zeros(rows, dtype=np.int64)     # 0 means empty stack
+    pushed = np.zeros(rows, dtype=np.int64)  # next value to push, shifted
+    fail = np.full(rows, -1, dtype=np.int64)
+    for j in range(n):
+        v = a[:, j].astype(np.int64) + 1
+        bad = (v < 1) | (v > n) | ((v <= pushed) & (v != top))
+        fail[bad & (fail < 0)] = j
+        v = np.clip(v, 1, n)
+        pushed = np.maximum(pushed, v)
+        pv = prev[r, v]
+        nv = nxt[r, v]
+        nxt[r, pv] = nv
+        prev[r, nv] = pv
+        top = pv
+    return fail
+
+def first_invalid_many(perms, processes=None, chunksize=4096):
+    """first_invalid of every permutation of 0..n-1 in perms, pushed in
+    order 0..n-1. A 2-D numpy array is checked column by column for all
+    rows at once and returns an array, other iterables are split across a
+    process pool and return a list
+    """
+    # an ndarray can only exist if numpy was imported by the caller, so
+    # is_valid() and first_invalid() never pay for importing numpy
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(perms, np.ndarray):
+        return _first_invalid_rows(perms)
+    import multiprocessing
+    with multiprocessing.Pool(processes) as pool:
+        return pool.map(_first_invalid_perm, perms, chunksize)
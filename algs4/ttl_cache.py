@@ -0,0 +1,258 @@
+import sys
+import time
+from collections import Counter
+
+from .index_min_pq import IndexMinPQ
+from .rbtree import RBTree
+
+class TTLCache:
+    """cache of at most maxsize entries and maxbytes(None means unlimited)
+    bytes of values measured by sizeof, evicting expired entries first and
+    then the least recently used ones.
+
+    Every entry lives in a slot 0..maxsize-1. The RBTree maps keys to slots
+    and keeps them ordered, one IndexMinPQ indexed by slot keeps expiry
+    times and another keeps the tick of the last use, so get/put/touch/
+    delete are O(log n). Expired entries are dropped when they are read or
+    by evict_expired(now), until then they are still seen by the ordered
+    scans. now defaults to clock()
+    """
+    def __init__(self, maxsize, maxbytes=None, ttl=None, sizeof=sys.getsizeof,
+                 clock=time.monotonic):
+        if maxsize <= 0:
+            raise ValueError('maxsize should be positive')
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.clock = clock
+        self.nbytes = 0
+        self.stats = Counter() # hits, misses, evictions, expirations
+        self._tree = RBTree()  # key -> slot
+        self._expiry = IndexMinPQ(maxsize)
+        self._recency = IndexMinPQ(maxsize)
+        self._tick = 0
+        self._keys = [None] * maxsize
+        self._values = [None] * maxsize
+        self._sizes = [0] * maxsize
+        self._ttls = [None] * maxsize
+        self._free = list(range(maxsize - 1, -1, -1))
+
+    def __len__(self):
+        return self.maxsize - len(self._free)
+
+    def __contains__(self, key):
+        return self._tree.contains(key)
+
+    def _slot(self, key):
+        try:
+            return self._tree.get(key)
+        except ValueError:
+            return None
+
+    def _expired(self, slot, now):
+        return (self._expiry.contains(slot)
+                and self._expiry.keyOf(slot) <= now)
+
+    def _use(self, slot):
+        self._tick += 1
+        if self._recency.contains(slot):
+            self._recency.change(slot, self._tick)
+        else:
+            self._recency.insert(slot, self._tick)
+
+    def _expire_at(self, slot, ttl, now):
+        if ttl is None:
+            if self._expiry.contains(slot):
+                self._expiry.delete(slot)
+        elif self._expiry.contains(slot):
+            self._expiry.change(slot, now + ttl)
+        else:
+            self._expiry.insert(slot, now + ttl)
+
+    def _remove(self, slot):
+        self._tree.delete(self._keys[slot])
+        if self._expiry.contains(slot):
+            self._expiry.delete(slot)
+        self._recency.delete(slot)
+        self.nbytes -= self._sizes[slot]
+        self._keys[slot] = self._values[slot] = self._ttls[slot] = None
+        self._sizes[slot] = 0
+        self._free.append(slot)
+
+    def get(self, key, default=None, now=None):
+        slot = self._slot(key)
+        if slot is not None and self._expired(
+                slot, self.clock() if now is None else now):
+            self._remove(slot)
+            self.stats['expirations'] += 1
+            slot = None
+        if slot is None:
+            self.stats['misses'] += 1
+            return default
+        self.stats['hits'] += 1
+        self._use(slot)
+        return self._values[slot]
+
+    def put(self, key, value, ttl=None, now=None):
+        """ttl defaults to the one of the cache, raise ValueError if value
+        alone is bigger than maxbytes
+        """
+        if now is None:
+            now = self.clock()
+        if ttl is None:
+            ttl = self.ttl
+        size = self.sizeof(value) if self.maxbytes is not None else 0
+        if self.maxbytes is not None and size > self.maxbytes:
+            raise ValueError('value is bigger than maxbytes')
+
+        slot = self._slot(key)
+        if slot is not None:
+            # the old value goes away, so it can't be evicted for the new one
+            self.nbytes -= self._sizes[slot]
+            self._sizes[slot] = 0
+            self._expire_at(slot, None, now)
+            self._recency.delete(slot)
+        self._make_room(size, slot is None, now)
+        if slot is None:
+            slot = self._free.pop()
+            self._keys[slot] = key
+            self._tree.put(key, slot)
+        self._values[slot] = value
+        self._sizes[slot] = size
+        self.nbytes += size
+        self._ttls[slot] = ttl
+        self._expire_at(slot, ttl, now)
+        self._use(slot)
+
+    def _make_room(self, size, new_slot, now):
+        """evict until size more bytes, and a new slot if asked, fit,
+        expired entries go first
+        """
+        while ((new_slot and not self._free)
+               or (self.maxbytes is not None
+                   and self.nbytes + size > self.maxbytes)):
+            if not self._expiry.isEmpty() and self._expiry.minKey() <= now:
+                self._remove(self._expiry.minIndex())
+                self.stats['expirations'] += 1
+            else:
+                self._remove(self._recency.minIndex())
+                self.stats['evictions'] += 1
+
+    def touch(self, key, ttl=None, now=None):
+        """mark key as used and restart its ttl(defaults to the one it was
+        put with, a new one replaces it), return False if it is not cached
+        or has expired
+        """
+        if now is None:
+            now = self.clock()
+        slot = self._slot(key)
+        if slot is None:
+            return False
+        if self._expired(slot, now):
+            self._remove(slot)
+            self.stats['expirations'] += 1
+            return False
+        if ttl is not None:
+            self._ttls[slot] = ttl
+        self._expire_at(slot, self._ttls[slot], now)
+        self._use(slot)
+        return True
+
+    def delete(self, key):
+        """return False if key is not cached"""
+        slot = self._slot(key)
+        if slot is None:
+            return False
+        self._remove(slot)
+        return True
+
+    def evict_expired(self, now=None, limit=None):
+        """drop at most limit(None means no limit) entries expired at now,
+        earliest first, and return how many were dropped
+        """
+        if now is None:
+            now = self.clock()
+        n = 0
+        while (not self._expiry.isEmpty() and self._expiry.minKey() <= now
+               and (limit is None or n < limit)):
+            self._remove(self._expiry.minIndex())
+            n += 1
+        self.stats['expirations'] += n
+        return n
+
+    def floor(self, key):
+        return self._tree.floor(key)
+
+    def ceiling(self, key):
+        return self._tree.ceiling(key)
+
+    def keys(self):
+        """cached keys in order"""
+        return self._tree.keys()
+
+class _OrderedDictLRU:
+    """LRU baseline for the benchmark"""
+    def __init__(self, maxsize):
+        from collections import OrderedDict
+        self.maxsize = maxsize
+        self.d = OrderedDict()
+        self.stats = Counter()
+
+    def get(self, key):
+        try:
+            self.d.move_to_end(key)
+        except KeyError:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return self.d[key]
+
+    def put(self, key, value):
+        self.d[key] = value
+        self.d.move_to_end(key)
+        if len(self.d) > self.maxsize:
+            self.d.popitem(last=False)
+            self.stats['evictions'] += 1
+
+def zipf(n, keys, s=1.0):
+    """n keys of range(keys) where key k is drawn with weight 1/(k+1)^s"""
+    import random
+    from itertools import accumulate
+    weights = list(accumulate(1 / (k + 1) ** s for k in range(keys)))
+    return random.choices(range(keys), cum_weights=weights, k=n)
+
+def benchmark(n=1 << 17, keys=1 << 14, sizes=(256, 1024, 4096), s=1.0):
+    """read through caches under Zipfian access, a miss puts the key.
+    Print ops/s, hit ratio and evictions
+    """
+    # only the benchmark pays for random
+    import random
+
+    random.seed(n)
+    trace = zipf(n, keys, s)
+    print(f'{n} gets over {keys} keys, zipf s={s}')
+    print(f'{"cache":<34}{"ops/s":>10}{"hit%":>8}{"evictions":>11}')
+    for maxsize in sizes:
+        # with a ttl the position in the trace is the clock
+        for label, cache, ttl in [
+                (f'OrderedDict LRU {maxsize}', _OrderedDictLRU(maxsize), None),
+                (f'TTLCache {maxsize}', TTLCache(maxsize), None),
+                (f'TTLCache {maxsize} ttl {n >> 3}', TTLCache(maxsize),
+                 n >> 3),
+                # ints take 28 bytes, so about half of maxsize fits
+                (f'TTLCache {maxsize} {maxsize * 14}B', TTLCache(
+                    maxsize, maxbytes=maxsize * 14), None)]:
+            start = time.perf_counter()
+            if ttl is None:
+                for key in trace:
+                    if cache.get(key) is None:
+                        cache.put(key, key)
+            else:
+                for now, key in enumerate(trace):
+                    if cache.get(key, now=now) is None:
+                        cache.put(key, key, ttl, now)
+            seconds = time.perf_counter() - start
+            hits = cache.stats['hits']
+            print(f'{label:<34}{n / seconds:>10.0f}'
+                  f'{100 * hits / n:>8.1f}{cache.stats["evictions"]:>11}')
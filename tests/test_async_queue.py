@@ -0,0 +1,29 @@
+import asyncio
+import unittest
+
+from algs4.async_queue import AsyncBoundedQueue
+
+class AsyncBoundedQueueTest(unittest.IsolatedAsyncioTestCase):
+    async def test_cancelled_getter_passes_wakeup_on(self):
+        q = AsyncBoundedQueue()
+        first = asyncio.create_task(q.get())
+        second = asyncio.create_task(q.get())
+        await asyncio.sleep(0)
+        await q.put(1)  # wakes first, which never runs
+        first.cancel()
+        self.assertEqual(await asyncio.wait_for(second, 1), 1)
+        self.assertEqual(q.qsize(), 0)
+
+    async def test_cancelled_putter_passes_wakeup_on(self):
+        q = AsyncBoundedQueue(1)
+        await q.put(0)
+        first = asyncio.create_task(q.put(1))
+        second = asyncio.create_task(q.put(2))
+        await asyncio.sleep(0)
+        self.assertEqual(await q.get(), 0)  # wakes first, which never runs
+        first.cancel()
+        await asyncio.wait_for(second, 1)
+        self.assertEqual(await q.get(), 2)
+
+if __name__ == '__main__':
+    unittest.main()